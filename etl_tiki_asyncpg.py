@@ -0,0 +1,136 @@
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Tuple
+
+import asyncpg
+
+from config import load_config
+from etl_tiki_to_postgres import (
+    DDL_PRODUCTS,
+    PRODUCT_COLS,
+    UPSERT_PRODUCTS_SQL,
+    dumps_json,
+    err,
+    iter_product_files,
+    iter_products_from_file,
+    warn,
+)
+
+
+# ----------------------------
+# Settings (edit here, same as etl_tiki_to_postgres.py)
+# ----------------------------
+
+DATA_DIR = Path("./data")
+INI_PATH = "database.ini"
+BATCH_SIZE = 10000
+POOL_MIN_SIZE = 4
+POOL_MAX_SIZE = 8
+
+
+def _project(item: dict, source_file: str) -> Tuple:
+    """Map a raw product dict to a tiki_products record for COPY."""
+    price = item.get("price")
+    return (
+        int(item["id"]),
+        item.get("name"),
+        item.get("url_key"),
+        None if price is None else Decimal(str(price)),
+        item.get("description"),
+        dumps_json(item.get("images", [])),
+        source_file,
+    )
+
+
+def _read_batches(fp: Path, batch_size: int) -> List[List[Tuple]]:
+    """Parse one file into record batches (runs in a worker thread)."""
+    batches: List[List[Tuple]] = []
+    rows: List[Tuple] = []
+    bad_items = 0
+    for item in iter_products_from_file(fp):
+        try:
+            rows.append(_project(item, fp.name))
+        except Exception:
+            bad_items += 1
+            continue
+        if len(rows) >= batch_size:
+            batches.append(rows)
+            rows = []
+    if rows:
+        batches.append(rows)
+    if bad_items:
+        warn(f"{fp.name}: skipped {bad_items} item(s) with missing/invalid 'id'")
+    return batches
+
+
+async def load_file(pool: asyncpg.Pool, fp: Path, batch_size: int) -> int:
+    """COPY one file's products into tiki_products via a staging table."""
+    batches = await asyncio.to_thread(_read_batches, fp, batch_size)
+    loaded = 0
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "CREATE TEMP TABLE _stg_products "
+                "(LIKE tiki_products INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            for rows in batches:
+                # Last-wins dedup by id: duplicate ids in one ON CONFLICT
+                # statement raise cardinality_violation.
+                rows = list({r[0]: r for r in rows}.values())
+                await conn.copy_records_to_table(
+                    "_stg_products",
+                    records=rows,
+                    columns=list(PRODUCT_COLS),
+                )
+                await conn.execute(UPSERT_PRODUCTS_SQL)
+                await conn.execute("TRUNCATE _stg_products")
+                loaded += len(rows)
+    print(f"Loaded {loaded} products from {fp.name}")
+    return loaded
+
+
+async def main() -> int:
+    files = iter_product_files(DATA_DIR)
+    print(f"Found {len(files)} file(s) from {DATA_DIR.resolve()}")
+
+    db_params = load_config(filename=INI_PATH, section="postgresql")
+
+    pool = await asyncpg.create_pool(
+        **db_params, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE
+    )
+    try:
+        async with pool.acquire() as conn:
+            await conn.execute(DDL_PRODUCTS)
+
+        # One slot per pool connection: parsing of the next files overlaps
+        # the COPY of the current ones without over-acquiring the pool.
+        sem = asyncio.Semaphore(POOL_MAX_SIZE)
+
+        async def guarded(fp: Path) -> int:
+            async with sem:
+                return await load_file(pool, fp, BATCH_SIZE)
+
+        totals = await asyncio.gather(*(guarded(fp) for fp in files))
+    finally:
+        await pool.close()
+
+    print(f"Done. products={sum(totals)}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(asyncio.run(main()))
+    except FileNotFoundError as e:
+        err(str(e))
+        raise SystemExit(2)
+    except (ValueError, RuntimeError) as e:
+        err(str(e))
+        raise SystemExit(2)
+    except KeyboardInterrupt:
+        err("Cancelled by user (Ctrl+C).")
+        raise SystemExit(130)
+    except Exception as e:
+        err(f"Unexpected error: {e}")
+        raise SystemExit(4)